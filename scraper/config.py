@@ -20,8 +20,14 @@ class Settings:
 
     max_retries: int
     download_timeout_ms: int
-    page_delay_ms: int
+    max_backoff_s: float
     batch_size: int
+    context_pool: int
+    download_workers: int
+    max_content_chars: int
+    max_pdf_bytes: int
+    auth_state_path: str | None
+    auth_state_ttl_s: int
     headless: bool
 
     log_level: str
@@ -52,8 +58,14 @@ def load_settings() -> Settings:
 
     max_retries = int(os.getenv("MAX_RETRIES", "5") or 5)
     download_timeout_ms = int(os.getenv("DOWNLOAD_TIMEOUT", "60000") or 60000)
-    page_delay_ms = int(os.getenv("PAGE_DELAY", "20000") or 20000)
+    max_backoff_s = float(os.getenv("MAX_BACKOFF", "60") or 60)
     batch_size = int(os.getenv("BATCH_SIZE", "10") or 10)
+    context_pool = max(int(os.getenv("CONTEXT_POOL", "4") or 4), 1)
+    download_workers = max(int(os.getenv("DOWNLOAD_WORKERS", "8") or 8), 1)
+    max_content_chars = int(os.getenv("MAX_CONTENT_CHARS", "200000") or 200000)
+    auth_state_path = os.getenv("AUTH_STATE_PATH", ".auth/state.json").strip() or None
+    auth_state_ttl_s = int(os.getenv("AUTH_STATE_TTL", "3600") or 3600)
+    max_pdf_bytes = int(os.getenv("MAX_PDF_BYTES", str(20 * 1024 * 1024)) or 20 * 1024 * 1024)
     headless = get_bool(os.getenv("HEADLESS", "true"), True)
 
     log_level = os.getenv("LOG_LEVEL", "info").strip()
@@ -76,8 +88,14 @@ def load_settings() -> Settings:
         end_page=end_page,
         max_retries=max_retries,
         download_timeout_ms=download_timeout_ms,
-        page_delay_ms=page_delay_ms,
+        max_backoff_s=max_backoff_s,
         batch_size=batch_size,
+        context_pool=context_pool,
+        download_workers=download_workers,
+        max_content_chars=max_content_chars,
+        max_pdf_bytes=max_pdf_bytes,
+        auth_state_path=auth_state_path,
+        auth_state_ttl_s=auth_state_ttl_s,
         headless=headless,
         log_level=log_level,
     )
@@ -1,19 +1,33 @@
-from io import BytesIO
+from functools import lru_cache
 from typing import Optional, Tuple
-from pdfminer.high_level import extract_text
-from pdfminer.pdfpage import PDFPage
 
 
-def extract_text_from_pdf(pdf_bytes: bytes, max_chars: Optional[int] = None) -> str:
-    """Extract text from PDF bytes. Optionally truncate to save storage."""
-    with BytesIO(pdf_bytes) as bio:
-        text = extract_text(bio) or ""
-    if max_chars is not None and len(text) > max_chars:
-        return text[:max_chars]
-    return text
+@lru_cache(maxsize=None)
+def _get_fitz():
+    # Imported on first use so CLI startup (and the main process, which hands
+    # parsing to worker processes) does not pay for loading PyMuPDF
+    import fitz
+
+    return fitz
 
 
-def count_pdf_pages(pdf_bytes: bytes) -> int:
-    with BytesIO(pdf_bytes) as bio:
-        return sum(1 for _ in PDFPage.get_pages(bio))
+def extract_text_and_pages(pdf_bytes: bytes, max_chars: Optional[int] = None) -> Tuple[str, int]:
+    """Extract text and page count from PDF bytes in a single parse.
+
+    When max_chars is set, pages past the limit are not decoded at all.
+    """
+    parts = []
+    size = 0
+    with _get_fitz().open(stream=pdf_bytes, filetype="pdf") as doc:
+        pages = doc.page_count
+        for page in doc:
+            chunk = page.get_text("text")
+            parts.append(chunk)
+            size += len(chunk)
+            if max_chars is not None and size >= max_chars:
+                break
+    text = "".join(parts)
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+    return text, pages
 
@@ -1,20 +1,90 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable, Optional, AsyncIterable, Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, AsyncIterable, Tuple
+from urllib.parse import urljoin
 
-from playwright.async_api import async_playwright, Browser, Page
-from tenacity import retry, stop_after_attempt, wait_exponential
+from playwright.async_api import async_playwright, Browser, BrowserContext, Error as PlaywrightError, Page, TimeoutError as PlaywrightTimeoutError
+from tenacity import AsyncRetrying, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from .config import Settings
 from .logger import setup_logger
-from .pdf_utils import extract_text_from_pdf, count_pdf_pages
-from .supabase_client import SupabaseHelper
+from .pdf_utils import extract_text_and_pages
+from .supabase_client import INSERT_BATCH_LIMIT, INSERT_FLUSH_INTERVAL, SupabaseHelper
 
 
-@dataclass
+_BASE = "https://supremecourt.govmu.org"
+_PAGE_PARAM = re.compile(r"[?&]page=(\d+)")
+
+# Responses that mean the server wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+# Resource types the scraper never needs; scripts stay enabled for the pager
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+ROWS_SCRIPT = """
+() => Array.from(document.querySelectorAll('table tbody tr')).map((r) => {
+    const text = (sel) => (r.querySelector(sel)?.innerText || '').trim();
+    const href = (sel) => r.querySelector(sel)?.getAttribute('href') || '';
+    return {
+        title: text('td.views-field-title, td.views-field.views-field-title'),
+        doc: text('td.views-field-field-document-number-hidden'),
+        date: text('td.views-field-field-delivered-on'),
+        preview: href('td.views-field-field-document-number-hidden a'),
+        href: href('td.views-field-nothing-1 a.faDownload, td .faDownload'),
+    };
+})
+"""
+
+_DDMMYYYY = re.compile(r"^(\d{2})/(\d{2})/(\d{4})$")
+# Non-padded dates like 1/8/2025 miss the fast path but still match %d/%m/%Y
+_FALLBACK_DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d/%m/%y")
+
+
+def _parse_date(value: str) -> str | None:
+    # Parse date safely: expected formats like 22/08/2025
+    value = value.strip()
+    m = _DDMMYYYY.match(value)
+    if m:
+        day, month, year = (int(g) for g in m.groups())
+        try:
+            return datetime(year, month, day).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+    for fmt in _FALLBACK_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
+    return None
+
+
+_PDF_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _available_cpus() -> int:
+    # cpu_count() reports host cores even when the container is pinned to fewer
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+class ThrottledError(RuntimeError):
+    """The server answered with a throttling status; the download should be retried."""
+
+
+@dataclass(slots=True)
 class Judgment:
     title: str
     document_number: str
@@ -22,6 +92,7 @@ class Judgment:
     pdf_url: str
     pdf_preview_url: str
     page_index: int
+    extracted_at: str = ""
 
 
 class CourtScraper:
@@ -37,15 +108,92 @@ class CourtScraper:
         self.browser: Browser = await self.playwright.chromium.launch(
             headless=self.settings.headless, args=["--no-sandbox", "--disable-dev-shm-usage"]
         )
-        self.context = await self.browser.new_context(accept_downloads=True)
-        self.page: Page = await self.context.new_page()
+        # Restore a recent login session, if one was saved, to skip the 2FA flow
+        storage_state = self._fresh_auth_state()
+        self.session_restored = storage_state is not None
+        # Each context gets its own page; pages are scraped concurrently
+        self.contexts: List[BrowserContext] = []
+        self.pages: List[Page] = []
+        for _ in range(self.settings.context_pool):
+            context = await self.browser.new_context(accept_downloads=True, storage_state=storage_state)
+            await context.route("**/*", self._block_resources)
+            self.contexts.append(context)
+            self.pages.append(await context.new_page())
+        # The first context performs login and PDF downloads
+        self.context = self.contexts[0]
+        self.page: Page = self.pages[0]
+        # PDF parsing is CPU-bound; run it in worker processes to keep the event loop free
+        self.parse_workers = _available_cpus()
+        self.pdf_pool = self._new_pdf_pool(self.parse_workers)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.context.close()
+        self.pdf_pool.shutdown(wait=True, cancel_futures=True)
+        for context in self.contexts:
+            await context.close()
         await self.browser.close()
         await self.playwright.stop()
 
+    @staticmethod
+    async def _block_resources(route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _fresh_auth_state(self) -> Optional[str]:
+        path = self.settings.auth_state_path
+        if not path or not os.path.isfile(path):
+            return None
+        if time.time() - os.path.getmtime(path) > self.settings.auth_state_ttl_s:
+            return None
+        # A truncated or corrupt file would make new_context() fail on every run
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            if not isinstance(state, dict) or not isinstance(state.get("cookies"), list):
+                raise ValueError("missing cookies")
+        except (OSError, ValueError) as e:
+            self.logger.warning("Discarding unreadable auth state %s: %s", path, e)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return path
+
+    async def save_session(self) -> None:
+        path = self.settings.auth_state_path
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            await self.context.storage_state(path=path)
+            # The file holds live session cookies
+            os.chmod(path, 0o600)
+        except Exception as e:
+            self.logger.warning("Could not save auth state to %s: %s", path, e)
+
+    async def session_valid(self) -> bool:
+        # Positive check: a restored session is only usable if the judgments table
+        # renders; any redirect (server, meta-refresh or client-side) to login fails it
+        await self.page.goto(self.settings.target_url, wait_until="domcontentloaded")
+        try:
+            await self.page.wait_for_selector("table tbody tr", state="attached", timeout=15000)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    async def ensure_logged_in(self) -> None:
+        if self.session_restored:
+            if await self.session_valid():
+                self.logger.info("Reusing saved login session")
+                return
+            self.logger.info("Saved login session expired; logging in again")
+        await self.login()
+        await self.save_session()
+        await self.share_session()
+
     @retry(wait=wait_exponential(multiplier=1, min=1, max=10), stop=stop_after_attempt(5))
     async def login(self) -> None:
         s = self.settings
@@ -55,7 +203,9 @@ class CourtScraper:
         await self.page.fill("#plainTextPassword", s.password)
         # Submit via pressing Enter in password field
         await self.page.press("#plainTextPassword", "Enter")
-        await self.page.wait_for_load_state("networkidle")
+        # The login form disappears once we land on the 2FA step or the portal
+        await self.page.wait_for_selector("#plainTextPassword", state="detached", timeout=30000)
+        await self.page.wait_for_load_state("domcontentloaded")
         # Handle MauPass 2FA send security code step if present
         try:
             if "maupass.govmu.org/Account/SendSecurityCode" in (self.page.url or ""):
@@ -63,7 +213,6 @@ class CourtScraper:
                 selector = "div.kt-login__actions input[type='submit'][value='Submit']"
                 await self.page.wait_for_selector(selector, timeout=15000)
                 await self.page.click(selector)
-                await self.page.wait_for_load_state("networkidle")
                 # Small pause to observe transition after requesting code
                 await asyncio.sleep(2)
 
@@ -108,7 +257,10 @@ class CourtScraper:
                         await self.page.wait_for_selector(submit_selector, timeout=15000)
                         self.logger.info("Clicking final Submit for TOTP verification")
                         await self.page.click(submit_selector)
-                        await self.page.wait_for_load_state("networkidle")
+                        try:
+                            await self.page.wait_for_selector("#Code", state="detached", timeout=20000)
+                        except PlaywrightTimeoutError:
+                            pass
                         # Small pause to observe the post-submit state
                         await asyncio.sleep(2)
 
@@ -123,85 +275,102 @@ class CourtScraper:
                         else:
                             self.logger.warning("TOTP verification may not have completed; still on 2FA page")
                     except Exception as e:
-                        self.logger.error(f"TOTP handling failed: {e}")
+                        self.logger.error("TOTP handling failed: %s", e)
         except Exception as e:
-            self.logger.warning(f"2FA SendSecurityCode step skipped or failed: {e}")
+            self.logger.warning("2FA SendSecurityCode step skipped or failed: %s", e)
         self.logger.info("Login complete")
 
-    async def navigate_to_page(self, page_index: int) -> None:
+    async def navigate_to_page(self, page: Page, page_index: int) -> None:
         url = f"{self.settings.target_url}?page={page_index}"
-        await self.page.goto(url, wait_until="domcontentloaded")
-        await self.page.wait_for_load_state("networkidle")
+        await page.goto(url, wait_until="domcontentloaded")
+        try:
+            await page.wait_for_selector("table tbody tr", state="attached", timeout=15000)
+        except PlaywrightTimeoutError:
+            self.logger.warning("No judgment rows found on page %d", page_index + 1)
 
-    async def iterate_rows(self) -> AsyncIterable[Judgment]:
-        # Use stable class selectors instead of column positions
-        rows = await self.page.query_selector_all("table tbody tr")
+    async def iterate_rows(self, page: Page) -> AsyncIterable[Judgment]:
+        # Use stable class selectors instead of column positions; read every row
+        # in one evaluate call rather than several round-trips per cell
+        rows = await page.evaluate(ROWS_SCRIPT)
         for row in rows:
-            title_el = await row.query_selector("td.views-field-title, td.views-field.views-field-title")
-            doc_el = await row.query_selector("td.views-field-field-document-number-hidden")
-            date_el = await row.query_selector("td.views-field-field-delivered-on")
-
-            title = (await title_el.inner_text()).strip() if title_el else ""
-            doc_no = (await doc_el.inner_text()).strip() if doc_el else ""
-            delivered_on = (await date_el.inner_text()).strip() if date_el else ""
-
-            # Extract preview URL from anchor inside the document-number cell
-            preview_href = None
-            try:
-                preview_link_el = await row.query_selector("td.views-field-field-document-number-hidden a")
-                if preview_link_el:
-                    preview_href = await preview_link_el.get_attribute("href")
-            except Exception:
-                preview_href = None
-            if preview_href:
-                pdf_preview_url = preview_href if preview_href.startswith("http") else f"https://supremecourt.govmu.org{preview_href}"
-            else:
-                pdf_preview_url = ""
-
-            link_el = await row.query_selector("td.views-field-nothing-1 a.faDownload, td .faDownload")
-            if not link_el:
-                continue
-            href = await link_el.get_attribute("href")
+            href = row["href"]
             if not href:
                 continue
-            pdf_url = href if href.startswith("http") else f"https://supremecourt.govmu.org{href}"
-            yield Judgment(title=title, document_number=doc_no, delivered_on=delivered_on, pdf_url=pdf_url, pdf_preview_url=pdf_preview_url, page_index=0)
+            pdf_url = urljoin(_BASE, href)
+            preview_href = row["preview"]
+            pdf_preview_url = urljoin(_BASE, preview_href) if preview_href else ""
+            yield Judgment(title=row["title"], document_number=row["doc"], delivered_on=row["date"], pdf_url=pdf_url, pdf_preview_url=pdf_preview_url, page_index=0)
 
     async def download_pdf_bytes(self, url: str) -> Tuple[bytes, str]:
         # Use context's request for lightweight download
         resp = await self.context.request.get(url, timeout=self.settings.download_timeout_ms)
-        if not resp.ok:
-            raise RuntimeError(f"Failed to download PDF: {resp.status}")
-        # Try to infer filename from headers, else fallback to URL id
-        filename = "judgment.pdf"
+        # Playwright keeps every response body until it is disposed, so always release it
         try:
-            cd = resp.headers.get("content-disposition") or resp.headers.get("Content-Disposition")
-            if cd and "filename=" in cd:
-                filename = cd.split("filename=")[-1].strip('"\' ')
-            else:
+            self._record_status(resp.status)
+            if resp.status in THROTTLE_STATUSES:
+                raise ThrottledError(f"Throttled downloading PDF: {resp.status}")
+            if not resp.ok:
+                raise RuntimeError(f"Failed to download PDF: {resp.status}")
+            # Playwright already lower-cases header names
+            headers = resp.headers
+            max_bytes = self.settings.max_pdf_bytes
+            # get() resolves only after the driver has buffered the whole body, so this
+            # doesn't avoid the download; it keeps oversized PDFs from being copied across
+            # IPC into Python and parsed
+            content_length = headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise RuntimeError(f"PDF too large ({content_length} bytes > {max_bytes}); skipping")
+            # Try to infer filename from headers, else fallback to URL id
+            filename = "judgment.pdf"
+            try:
+                cd = headers.get("content-disposition")
+                if cd and "filename=" in cd:
+                    filename = cd.split("filename=")[-1].strip('"\' ')
+                else:
+                    filename = url.rstrip("/").split("/")[-1] + ".pdf"
+            except Exception:
                 filename = url.rstrip("/").split("/")[-1] + ".pdf"
-        except Exception:
-            filename = url.rstrip("/").split("/")[-1] + ".pdf"
-        return await resp.body(), filename
+            body = await resp.body()
+        finally:
+            await resp.dispose()
+        if len(body) > max_bytes:
+            raise RuntimeError(f"PDF too large ({len(body)} bytes > {max_bytes}); skipping")
+        return body, filename
+
+    @staticmethod
+    def _new_pdf_pool(max_workers: int) -> ProcessPoolExecutor:
+        # Don't fork: by now the process has threads (default executor, pool manager)
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=_PDF_MP_CONTEXT)
 
-    async def process_judgment(self, j: Judgment) -> None:
+    def _replace_pdf_pool(self, broken: ProcessPoolExecutor) -> None:
+        # Several parse workers see the same broken pool; only the first replaces it
+        if self.pdf_pool is not broken:
+            return
+        self.logger.warning("PDF worker process died; restarting the parse pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.pdf_pool = self._new_pdf_pool(self.parse_workers)
+
+    async def parse_pdf(self, pdf_bytes: bytes) -> Tuple[str, int]:
+        loop = asyncio.get_running_loop()
+        max_chars = self.settings.max_content_chars
+        pool = self.pdf_pool
+        try:
+            return await loop.run_in_executor(pool, extract_text_and_pages, pdf_bytes, max_chars)
+        except BrokenProcessPool:
+            self._replace_pdf_pool(pool)
+        # A PDF that crashes MuPDF takes every in-flight document down with it. Retry
+        # each one in its own single-use process so only the bad PDF is lost
+        solo = self._new_pdf_pool(1)
         try:
-            pdf_bytes, file_name = await self.download_pdf_bytes(j.pdf_url)
-            text = extract_text_from_pdf(pdf_bytes)
-            pages = count_pdf_pages(pdf_bytes)
+            return await loop.run_in_executor(solo, extract_text_and_pages, pdf_bytes, max_chars)
+        finally:
+            solo.shutdown(wait=False)
 
-            # Parse date safely: expected formats like 22/08/2025
-            def parse_date(value: str) -> str | None:
-                for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d/%m/%y"):
-                    try:
-                        dt = datetime.strptime(value.strip(), fmt)
-                        return dt.strftime("%Y-%m-%d %H:%M:%S")
-                    except Exception:
-                        continue
-                return None
-
-            judgment_dt = parse_date(j.delivered_on) if j.delivered_on else None
-            extracted_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    async def process_judgment(self, j: Judgment, pdf_bytes: bytes, file_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            text, pages = await self.parse_pdf(pdf_bytes)
+            self.logger.debug("Extracted %d chars from %d pages of %s", len(text), pages, j.pdf_url)
+            judgment_dt = _parse_date(j.delivered_on) if j.delivered_on else None
             record = {
                 # Map to judgments7 schema
                 "case_number": j.document_number or None,
@@ -211,45 +380,211 @@ class CourtScraper:
                 "content": text,
                 "page_count": pages,
                 "page_number": j.page_index + 1,
-                "extracted_at": extracted_at,
+                "extracted_at": j.extracted_at,
                 "download_url": j.pdf_url,
             "pdf_preview_url": j.pdf_preview_url or None,
             }
-            self.sb.insert_judgment(record)
+            return record
         except Exception as e:
-            self.logger.error(f"Failed processing {j.pdf_url}: {e}")
+            self.logger.error("Failed processing %s: %s", j.pdf_url, e)
+            return None
 
-    async def run(self) -> None:
-        await self.login()
-        start = max(self.settings.start_page - 1, 0)
+    def _record_status(self, status: int) -> None:
+        # Responses are grouped into windows of batch_size. The first throttled response
+        # in a window doubles the cooldown; a window with none halves it. Downloads that
+        # were already in flight therefore cannot undo a backoff one response at a time
+        if status in THROTTLE_STATUSES and not self._window_throttled:
+            self._window_throttled = True
+            self._cooldown = min(self.settings.max_backoff_s, self._cooldown * 2 or 1.0)
+            self.logger.warning("Server returned %d; backing off %.1fs between downloads", status, self._cooldown)
+        self._window_count += 1
+        if self._window_count >= self.settings.batch_size:
+            if not self._window_throttled and self._cooldown:
+                self._cooldown = self._cooldown / 2 if self._cooldown >= 0.2 else 0.0
+            self._window_count = 0
+            self._window_throttled = False
+
+    async def download_worker(self) -> None:
+        while True:
+            j = await self.download_queue.get()
+            try:
+                # Throttled downloads are retried after the cooldown; only give up once
+                # MAX_RETRIES retries are exhausted
+                async for attempt in AsyncRetrying(
+                    retry=retry_if_exception_type(ThrottledError),
+                    stop=stop_after_attempt(self.settings.max_retries + 1),
+                    reraise=True,
+                ):
+                    with attempt:
+                        if self._cooldown:
+                            await asyncio.sleep(self._cooldown)
+                        pdf_bytes, file_name = await self.download_pdf_bytes(j.pdf_url)
+                await self.parse_queue.put((j, pdf_bytes, file_name))
+            except Exception as e:
+                self.logger.error("Failed downloading %s: %s", j.pdf_url, e)
+            finally:
+                self.download_queue.task_done()
+
+    async def parse_worker(self) -> None:
+        while True:
+            j, pdf_bytes, file_name = await self.parse_queue.get()
+            try:
+                record = await self.process_judgment(j, pdf_bytes, file_name)
+                if record is not None:
+                    await self.insert_queue.put(record)
+            finally:
+                self.parse_queue.task_done()
+
+    async def insert_worker(self) -> None:
+        # Accumulate records and flush when the batch is full or has waited long enough
+        loop = asyncio.get_running_loop()
+        records: List[Dict[str, Any]] = []
+        deadline = 0.0
+        try:
+            while True:
+                if records and (len(records) >= INSERT_BATCH_LIMIT or loop.time() >= deadline):
+                    # Detach the batch first so a cancel mid-flush can't replay it below
+                    batch, records = records, []
+                    await self.flush_records(batch)
+                timeout = max(deadline - loop.time(), 0) if records else None
+                # asyncio.timeout rather than wait_for: on 3.11 wait_for can swallow a
+                # cancellation that races with get() completing, leaving the worker stuck
+                try:
+                    async with asyncio.timeout(timeout):
+                        record = await self.insert_queue.get()
+                except TimeoutError:
+                    continue
+                if not records:
+                    deadline = loop.time() + INSERT_FLUSH_INTERVAL
+                records.append(record)
+        finally:
+            # On cancellation (including a failed run) still store what was parsed
+            while not self.insert_queue.empty():
+                records.append(self.insert_queue.get_nowait())
+            if records:
+                await self.flush_records(records)
+
+    async def flush_records(self, records: List[Dict[str, Any]]) -> None:
+        try:
+            # The Supabase client is synchronous; keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.sb.insert_judgments, records)
+        except Exception as e:
+            self.logger.error("Failed inserting batch of %d judgments: %s", len(records), e)
+        finally:
+            for _ in records:
+                self.insert_queue.task_done()
+
+    async def share_session(self) -> None:
+        # Reuse the logged-in session across the pool instead of logging in per context
+        cookies = await self.context.cookies()
+        for context in self.contexts[1:]:
+            await context.add_cookies(cookies)
+
+    async def scrape_pages(self, page: Page, first_index: int, step: int) -> None:
         end: Optional[int] = self.settings.end_page
 
-        page_index = start
+        page_index = first_index
+        failures = 0
         while True:
             if end is not None and page_index > end - 1:
                 break
-            self.logger.info(f"Scraping page {page_index + 1}")
-            await self.navigate_to_page(page_index)
-            tasks = []
-            async for j in self.iterate_rows():
-                j.page_index = page_index
-                tasks.append(asyncio.create_task(self.process_judgment(j)))
-                if len(tasks) >= self.settings.batch_size:
-                    await asyncio.gather(*tasks)
-                    tasks.clear()
-                    await asyncio.sleep(self.settings.page_delay_ms / 1000)
+            if self._last_page is not None and page_index > self._last_page:
+                break
+            self.logger.info("Scraping page %d", page_index + 1)
+            # A page that fails to load or parse is skipped; it must not stop the run
+            try:
+                await self.navigate_to_page(page, page_index)
+                # One extraction timestamp per listing page rather than per judgment
+                page_ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                rows = [j async for j in self.iterate_rows(page)]
+                next_link = await page.query_selector("nav.pager li.pager__item--next a") if end is None else None
+                current = await self.pager_index(page, "nav.pager li.pager__item.is-active a")
+            except PlaywrightError as e:
+                self.logger.error("Failed scraping page %d: %s", page_index + 1, e)
+                failures += 1
+                # Without END_PAGE only the pager ends the crawl; don't loop forever on a dead site
+                if failures > self.settings.max_retries:
+                    self.logger.error("Giving up after %d consecutive page failures", failures)
+                    break
+                page_index += step
+                continue
+            failures = 0
 
-            if tasks:
-                await asyncio.gather(*tasks)
+            # Drupal serves the last page for out-of-range indices; those rows were
+            # (or will be) queued by the context that owns the real last page
+            if current is not None and current < page_index:
+                self._set_last_page(current)
+            if self._last_page is not None and page_index > self._last_page:
+                break
+            for j in rows:
+                j.page_index = page_index
+                j.extracted_at = page_ts
+                await self.download_queue.put(j)
 
-            # Move to next page via "next" link if END_PAGE not set
+            # Stop at the last page via "next" link if END_PAGE not set
             if end is None:
-                next_link = await self.page.query_selector("nav.pager li.pager__item--next a")
                 if not next_link:
+                    self._set_last_page(page_index)
                     break
-                page_index += 1
-            else:
-                page_index += 1
+            page_index += step
+
+    def _set_last_page(self, page_index: int) -> None:
+        if self._last_page is None or page_index < self._last_page:
+            self._last_page = page_index
+
+    @staticmethod
+    async def pager_index(page: Page, selector: str) -> Optional[int]:
+        link = await page.query_selector(selector)
+        if not link:
+            return None
+        m = _PAGE_PARAM.search(await link.get_attribute("href") or "")
+        return int(m.group(1)) if m else None
+
+    async def find_last_page(self, start: int) -> Optional[int]:
+        # Read the pager once up front so every context is bounded by the real last
+        # page instead of probing past it concurrently
+        try:
+            await self.navigate_to_page(self.page, start)
+            last = await self.pager_index(self.page, "nav.pager li.pager__item--last a")
+            if last is not None:
+                return last
+            if not await self.page.query_selector("nav.pager li.pager__item--next a"):
+                return start
+        except PlaywrightError as e:
+            self.logger.warning("Could not read the last page from the pager: %s", e)
+        return None
+
+    async def run(self) -> None:
+        await self.ensure_logged_in()
+        start = max(self.settings.start_page - 1, 0)
+        self._last_page: Optional[int] = None
+        if self.settings.end_page is None:
+            self._last_page = await self.find_last_page(start)
+        # Seconds each download waits first; only non-zero after 429/503 responses
+        self._cooldown = 0.0
+        self._window_count = 0
+        self._window_throttled = False
+
+        # download -> parse -> insert pipeline; bounded queues apply backpressure
+        self.download_queue: asyncio.Queue = asyncio.Queue(maxsize=self.settings.batch_size)
+        self.parse_queue: asyncio.Queue = asyncio.Queue(maxsize=self.settings.batch_size)
+        self.insert_queue: asyncio.Queue = asyncio.Queue()
+
+        async with asyncio.TaskGroup() as tg:
+            workers = [tg.create_task(self.download_worker()) for _ in range(self.settings.download_workers)]
+            workers += [tg.create_task(self.parse_worker()) for _ in range(self.parse_workers)]
+            workers.append(tg.create_task(self.insert_worker()))
+
+            # Partition page indices round-robin across the context pool; a failing
+            # scraper cancels its siblings and the workers instead of being masked
+            step = len(self.pages)
+            async with asyncio.TaskGroup() as scrapers:
+                for offset, page in enumerate(self.pages):
+                    scrapers.create_task(self.scrape_pages(page, start + offset, step))
+            for queue in (self.download_queue, self.parse_queue, self.insert_queue):
+                await queue.join()
+            for worker in workers:
+                worker.cancel()
 
 
 async def run_scraper(settings: Settings) -> None:
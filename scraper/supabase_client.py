@@ -1,12 +1,43 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
+import httpx
+from postgrest.types import ReturnMethod
+from postgrest.utils import SyncClient
 from supabase import create_client, Client
 
+# Rows per insert request; keeps each PostgREST payload reasonably sized
+INSERT_BATCH_LIMIT = 100
+# Seconds a partial batch may wait before it is flushed anyway
+INSERT_FLUSH_INTERVAL = 1.0
+
 
 class SupabaseHelper:
     def __init__(self, url: str, service_key: str, table_name: str):
         self.client: Client = create_client(url, service_key)
         self.table_name = table_name
+        # Swap PostgREST's default session for a pooled HTTP/2 client so batch
+        # inserts reuse one TLS connection instead of reconnecting each time
+        postgrest = self.client.postgrest
+        default_session = postgrest.session
+        postgrest.session = SyncClient(
+            base_url=default_session.base_url,
+            headers=default_session.headers,
+            # Keep postgrest's own timeout (120s by default); ~20MB batches need it
+            timeout=default_session.timeout,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+        )
+        default_session.close()
 
-    def insert_judgment(self, record: Dict[str, Any]) -> None:
-        self.client.table(self.table_name).insert(record).execute()
-
+    def insert_judgments(self, records: List[Dict[str, Any]]) -> None:
+        # Postgres rejects an upsert that touches the same row twice, so keep only
+        # the last record per download URL
+        records = list({r["download_url"]: r for r in records}.values())
+        for i in range(0, len(records), INSERT_BATCH_LIMIT):
+            # Re-scraped judgments update their existing row, keyed by download URL
+            self.client.table(self.table_name).upsert(
+                records[i:i + INSERT_BATCH_LIMIT],
+                on_conflict="download_url",
+                # Don't echo the (large) content column back in the response
+                returning=ReturnMethod.minimal,
+            ).execute()